@@ -5,13 +5,16 @@ Provides a user-friendly interface for adjusting settings and calibration
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
 import cv2
+import numpy as np
 import threading
-import time
 from PIL import Image, ImageTk
 from eye_mouse_control import CalibrationData, BlinkConfig, EyeMouseController
 
+# Camera preview size (requested from the camera, so frames need no resize)
+PREVIEW_WIDTH = 320
+PREVIEW_HEIGHT = 240
+
 class ConfigGUI:
     def __init__(self, root):
         self.root = root
@@ -25,7 +28,19 @@ class ConfigGUI:
         # Camera preview variables
         self.camera_active = False
         self.cap = None
-        self.current_frame = None
+        self.max_redraw_ms = 50  # Preview updates every 50 ms (20 FPS)
+        
+        # Slider value labels waiting to be redrawn, mapped to their new text
+        self._label_dirty = {}
+        self._label_pending = False
+        
+        # Preview frames are written into one RGBA buffer that a PIL image
+        # maps directly (an RGB image would copy it), so showing a frame is
+        # just a paste into the same PhotoImage
+        self._rgb_buf = np.full((PREVIEW_HEIGHT, PREVIEW_WIDTH, 4), 255, dtype=np.uint8)
+        self._pil = Image.frombuffer('RGBA', (PREVIEW_WIDTH, PREVIEW_HEIGHT), self._rgb_buf, 'raw', 'RGBA', 0, 1)
+        self._flipped = np.empty((PREVIEW_HEIGHT, PREVIEW_WIDTH, 3), dtype=np.uint8)
+        self._photo = None
         
         # Create GUI elements
         self.create_widgets()
@@ -83,7 +98,7 @@ class ConfigGUI:
         x_sensitivity_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.x_sensitivity_label = ttk.Label(parent, text=f"{self.x_sensitivity_var.get():.2f}")
         self.x_sensitivity_label.grid(row=row, column=2)
-        x_sensitivity_scale.config(command=lambda v: self.x_sensitivity_label.config(text=f"{float(v):.2f}"))
+        x_sensitivity_scale.config(command=lambda v: self._on_scale(self.x_sensitivity_label, f"{float(v):.2f}"))
         row += 1
         
         # Y Sensitivity
@@ -93,7 +108,7 @@ class ConfigGUI:
         y_sensitivity_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.y_sensitivity_label = ttk.Label(parent, text=f"{self.y_sensitivity_var.get():.2f}")
         self.y_sensitivity_label.grid(row=row, column=2)
-        y_sensitivity_scale.config(command=lambda v: self.y_sensitivity_label.config(text=f"{float(v):.2f}"))
+        y_sensitivity_scale.config(command=lambda v: self._on_scale(self.y_sensitivity_label, f"{float(v):.2f}"))
         row += 1
         
         # Smoothing
@@ -103,7 +118,7 @@ class ConfigGUI:
         smoothing_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.smoothing_label = ttk.Label(parent, text=f"{self.smoothing_var.get():.2f}")
         self.smoothing_label.grid(row=row, column=2)
-        smoothing_scale.config(command=lambda v: self.smoothing_label.config(text=f"{float(v):.2f}"))
+        smoothing_scale.config(command=lambda v: self._on_scale(self.smoothing_label, f"{float(v):.2f}"))
         row += 1
         
         # Deadzone
@@ -113,7 +128,7 @@ class ConfigGUI:
         deadzone_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.deadzone_label = ttk.Label(parent, text=f"{self.deadzone_var.get()}")
         self.deadzone_label.grid(row=row, column=2)
-        deadzone_scale.config(command=lambda v: self.deadzone_label.config(text=f"{int(float(v))}"))
+        deadzone_scale.config(command=lambda v: self._on_scale(self.deadzone_label, f"{int(float(v))}"))
         row += 1
         
         # Blink Detection Settings
@@ -127,7 +142,7 @@ class ConfigGUI:
         ear_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.ear_label = ttk.Label(parent, text=f"{self.ear_threshold_var.get():.3f}")
         self.ear_label.grid(row=row, column=2)
-        ear_scale.config(command=lambda v: self.ear_label.config(text=f"{float(v):.3f}"))
+        ear_scale.config(command=lambda v: self._on_scale(self.ear_label, f"{float(v):.3f}"))
         row += 1
         
         # Consecutive Frames
@@ -137,7 +152,7 @@ class ConfigGUI:
         frames_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.frames_label = ttk.Label(parent, text=f"{self.consecutive_frames_var.get()}")
         self.frames_label.grid(row=row, column=2)
-        frames_scale.config(command=lambda v: self.frames_label.config(text=f"{int(float(v))}"))
+        frames_scale.config(command=lambda v: self._on_scale(self.frames_label, f"{int(float(v))}"))
         row += 1
         
         # Click Cooldown
@@ -147,7 +162,7 @@ class ConfigGUI:
         cooldown_scale.grid(row=row, column=1, sticky=(tk.W, tk.E))
         self.cooldown_label = ttk.Label(parent, text=f"{self.cooldown_var.get():.2f}")
         self.cooldown_label.grid(row=row, column=2)
-        cooldown_scale.config(command=lambda v: self.cooldown_label.config(text=f"{float(v):.2f}"))
+        cooldown_scale.config(command=lambda v: self._on_scale(self.cooldown_label, f"{float(v):.2f}"))
         row += 1
         
         # Blink Actions
@@ -181,63 +196,100 @@ class ConfigGUI:
         # Configure column weights
         parent.columnconfigure(1, weight=1)
     
+    def _on_scale(self, label, text):
+        """Queue a slider value label update, coalescing bursts of drag events"""
+        self._label_dirty[label] = text
+        if not self._label_pending:
+            self._label_pending = True
+            self.root.after_idle(self._flush_labels)
+    
+    def _flush_labels(self):
+        """Redraw every slider value label that changed since the last flush"""
+        for label, text in self._label_dirty.items():
+            label.config(text=text)
+        self._label_dirty.clear()
+        self._label_pending = False
+    
     def create_camera_preview(self, parent):
         """Create camera preview widget"""
         # Create a label to display camera feed
         self.camera_label = ttk.Label(parent, text="Camera feed will appear here")
         self.camera_label.pack(expand=True, fill=tk.BOTH)
+        self.camera_label.image = None
+        self._photo = ImageTk.PhotoImage(self._pil)
         
         # Status label
         self.status_label = ttk.Label(parent, text="Camera starting...")
         self.status_label.pack(pady=5)
     
     def start_camera_preview(self):
-        """Start camera preview in a separate thread"""
-        self.camera_active = True
-        self.camera_thread = threading.Thread(target=self.camera_preview_loop, daemon=True)
-        self.camera_thread.start()
-    
-    def camera_preview_loop(self):
-        """Camera preview loop"""
+        """Open the camera and start the preview tick"""
         self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-        
-        while self.camera_active:
-            ret, frame = self.cap.read()
-            if ret:
-                frame = cv2.flip(frame, 1)
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                self.current_frame = frame
-                
-                # Update GUI in main thread
-                self.root.after(0, self.update_camera_display)
-            time.sleep(0.03)  # ~30 FPS
+        # Let the webcam compress frames itself (MJPG) and keep only the
+        # newest frame queued so read() never returns a stale one
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, PREVIEW_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, PREVIEW_HEIGHT)
+        self.camera_active = True
         
+        # Capture and redraw from the Tk event loop on a fixed schedule, so
+        # the whole GUI runs on one thread
+        self.root.after(self.max_redraw_ms, self._tick)
+    
+    def stop_camera_preview(self):
+        """Stop the preview tick and release the camera"""
+        self.camera_active = False
         if self.cap:
             self.cap.release()
+            self.cap = None
+    
+    def _tick(self):
+        """Grab the newest camera frame, show it and schedule the next tick"""
+        if not self.camera_active:
+            return
+        
+        # Keep reading so the camera stays warm, but skip converting and
+        # painting frames while the preview can't be seen (e.g. minimized)
+        ret, frame = self.cap.read()
+        visible = self.camera_label.winfo_viewable() and self.root.state() != 'iconic'
+        if ret and visible:
+            if frame.shape[0] != PREVIEW_HEIGHT or frame.shape[1] != PREVIEW_WIDTH:
+                # Camera ignored the requested resolution (bilinear is the
+                # cheapest filter that looks the same on a live preview)
+                frame = cv2.resize(frame, (PREVIEW_WIDTH, PREVIEW_HEIGHT), interpolation=cv2.INTER_LINEAR)
+            # Mirror, then convert BGR to RGBA straight into the mapped buffer
+            cv2.flip(frame, 1, dst=self._flipped)
+            cv2.cvtColor(self._flipped, cv2.COLOR_BGR2RGBA, dst=self._rgb_buf)
+            self.update_camera_display()
+        
+        self.root.after(self.max_redraw_ms, self._tick)
     
     def update_camera_display(self):
         """Update camera display in GUI"""
-        if self.current_frame is not None:
-            # Convert to PIL Image and then to PhotoImage
-            image = Image.fromarray(self.current_frame)
-            image = image.resize((320, 240), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image=image)
-            
-            self.camera_label.configure(image=photo)
-            self.camera_label.image = photo  # Keep reference
+        # Copy the latest frame into the existing PhotoImage
+        self._photo.paste(self._pil)
+        
+        if self.camera_label.image is None:
+            # First frame - replace the placeholder text with the image
+            self.camera_label.configure(image=self._photo)
+            self.camera_label.image = self._photo  # Keep reference
             self.status_label.configure(text="Camera active")
     
+    def _sync_calibration_from_ui(self):
+        """Copy the slider values into the calibration object"""
+        calibration = self.calibration
+        calibration.sensitivity_x = self.x_sensitivity_var.get()
+        calibration.sensitivity_y = self.y_sensitivity_var.get()
+        calibration.smoothing_alpha = self.smoothing_var.get()
+        calibration.deadzone_px = self.deadzone_var.get()
+        calibration.ear_threshold = self.ear_threshold_var.get()
+        calibration.ear_consecutive_frames = self.consecutive_frames_var.get()
+    
     def save_settings(self):
         """Save current settings to calibration file"""
         # Update calibration object
-        self.calibration.sensitivity_x = self.x_sensitivity_var.get()
-        self.calibration.sensitivity_y = self.y_sensitivity_var.get()
-        self.calibration.smoothing_alpha = self.smoothing_var.get()
-        self.calibration.deadzone_px = self.deadzone_var.get()
-        self.calibration.ear_threshold = self.ear_threshold_var.get()
-        self.calibration.ear_consecutive_frames = self.consecutive_frames_var.get()
+        self._sync_calibration_from_ui()
         
         # Update blink config
         self.blink_config.single_blink_action = self.single_blink_var.get()
@@ -249,8 +301,7 @@ class ConfigGUI:
         self.calibration.save("calibration.json")
         
         # Save blink config
-        with open("blink_config.json", "w") as f:
-            json.dump(self.blink_config.__dict__, f, indent=2)
+        self.blink_config.save("blink_config.json")
         
         messagebox.showinfo("Success", "Settings saved successfully!")
     
@@ -281,13 +332,13 @@ class ConfigGUI:
     def start_calibration(self):
         """Start the calibration process"""
         # Stop camera preview
-        self.camera_active = False
-        time.sleep(0.1)  # Give thread time to stop
+        self.stop_camera_preview()
         
         # Close GUI and start main calibration
         self.root.destroy()
         
-        # Start main application in calibration mode
+        # Start main application in calibration mode (from the saved
+        # calibration: unsaved slider changes must not be written out by it)
         controller = EyeMouseController()
         controller.is_calibrating = True
         controller.run()
@@ -295,23 +346,16 @@ class ConfigGUI:
     def test_settings(self):
         """Test current settings with a temporary controller"""
         # Update calibration with current GUI values
-        self.calibration.sensitivity_x = self.x_sensitivity_var.get()
-        self.calibration.sensitivity_y = self.y_sensitivity_var.get()
-        self.calibration.smoothing_alpha = self.smoothing_var.get()
-        self.calibration.deadzone_px = self.deadzone_var.get()
-        self.calibration.ear_threshold = self.ear_threshold_var.get()
-        self.calibration.ear_consecutive_frames = self.consecutive_frames_var.get()
-        
-        # Save temporary calibration
-        self.calibration.save("temp_calibration.json")
+        self._sync_calibration_from_ui()
         
         messagebox.showinfo("Test Mode", "Test mode starting. Use ESC to return to configuration.")
         
         # Start test mode in separate thread
         def test_mode():
-            controller = EyeMouseController()
+            # Hand the in-memory calibration over directly; recalibrating in
+            # test mode still saves to the temporary file, not the real one
+            controller = EyeMouseController(calibration=self.calibration)
             controller.calibration_file = "temp_calibration.json"
-            controller.calibration = self.calibration
             controller.run()
         
         test_thread = threading.Thread(target=test_mode, daemon=True)
@@ -319,8 +363,7 @@ class ConfigGUI:
     
     def on_closing(self):
         """Handle window closing"""
-        self.camera_active = False
-        time.sleep(0.1)
+        self.stop_camera_preview()
         self.root.destroy()
 
 def main():
@@ -43,11 +43,20 @@ def create_eye_icon():
     
     # Save as ICO file with multiple sizes
     icon_sizes = [16, 32, 48, 64, 128, 256]
-    icon_images = []
     
-    for icon_size in icon_sizes:
-        resized = img.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
-        icon_images.append(resized)
+    # Halve the image level by level with a box filter (exact for 2x
+    # downsampling), each level built from the one above it
+    levels = {size: img}
+    level_size = size
+    while level_size > 16:
+        levels[level_size // 2] = levels[level_size].resize((level_size // 2, level_size // 2),
+                                                           Image.Resampling.BOX)
+        level_size //= 2
+    
+    # 48 is not a power of two, so resample it from the nearest larger level
+    levels[48] = levels[64].resize((48, 48), Image.Resampling.LANCZOS)
+    
+    icon_images = [levels[icon_size] for icon_size in icon_sizes]
     
     # Save as ICO
     icon_images[0].save('eye_mouse_control.ico', 
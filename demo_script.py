@@ -3,9 +3,7 @@ Demo script for Eye Mouse Control
 Shows the system capabilities and provides a guided tour
 """
 
-import cv2
 import time
-import numpy as np
 from pathlib import Path
 import sys
 import os
@@ -15,6 +13,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 def create_demo_video():
     """Create a demonstration video showing system features"""
+    # Imported here so the text-only menu options start without OpenCV
+    import cv2
+    import numpy as np
     
     # Create demo frames
     frames = []
@@ -33,18 +34,22 @@ def create_demo_video():
         ("Starting camera feed...", (0, 255, 0)),
     ]
     
-    for text, color in scenarios:
+    # Background shared by every frame, with the title drawn once
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.putText(base, "Eye Mouse Control Demo", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    
+    # Progress bar width for each slide
+    bar_widths = [int(width * (i + 1) / len(scenarios)) for i in range(len(scenarios))]
+    
+    for i, (text, color) in enumerate(scenarios):
         # Create frame
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        frame = base.copy()
         
         # Add text
         cv2.putText(frame, text, (50, height//2), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
-        cv2.putText(frame, "Eye Mouse Control Demo", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
         # Add progress indicator
-        progress = (scenarios.index((text, color)) + 1) / len(scenarios)
-        bar_width = int(width * progress)
-        cv2.rectangle(frame, (0, height - 20), (bar_width, height), (0, 255, 0), -1)
+        cv2.rectangle(frame, (0, height - 20), (bar_widths[i], height), (0, 255, 0), -1)
         
         frames.append(frame)
     
@@ -52,6 +57,7 @@ def create_demo_video():
 
 def show_demo():
     """Run the demo presentation"""
+    import cv2
     
     print("Eye Mouse Control - Demo")
     print("=" * 40)
@@ -70,13 +76,15 @@ def show_demo():
     for i, frame in enumerate(demo_frames):
         cv2.imshow("Eye Mouse Control - Demo", frame)
         
-        # Wait for key press or timeout
-        key = cv2.waitKey(3000) & 0xFF  # 3 second timeout
+        # Wait for key press or timeout, polling in short steps so the
+        # window keeps repainting and a key press advances immediately
+        deadline = time.monotonic() + 3  # 3 second timeout
+        key = 255
+        while key == 255 and time.monotonic() < deadline:
+            key = cv2.waitKey(30) & 0xFF
         
         if key == 27:  # ESC
             break
-        elif key != 255:  # Any key pressed
-            continue
     
     cv2.destroyAllWindows()
 
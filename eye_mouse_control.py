@@ -12,23 +12,139 @@ Press ESC to exit, SPACE to pause/resume, 'c' to calibrate
 """
 
 import cv2
-import mediapipe as mp
 import numpy as np
 import pyautogui
 import time
 import json
 import os
-from dataclasses import dataclass, asdict
+import argparse
+import threading
+from collections import deque
+from math import hypot
+from dataclasses import dataclass
 from typing import Tuple, Optional, Dict, Any
 import logging
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - the standard library writes the same files
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional - without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # Disable PyAutoGUI failsafe for this application
 pyautogui.FAILSAFE = False
 pyautogui.PAUSE = 0
 
+# The log format only uses the time, level and message, so skip the
+# caller, thread and process lookups logging otherwise does per record
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+def save_json(filepath: str, data: Dict[str, Any]) -> None:
+    """Write data to a JSON file with 2-space indentation"""
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode()
+    
+    # Write everything to a temporary file in one go, then swap it in so
+    # a crash mid-save never leaves a truncated settings file behind
+    tmp_path = f"{filepath}.tmp"
+    Path(tmp_path).write_bytes(content)
+    os.replace(tmp_path, filepath)
+
+def load_json(filepath: str) -> Dict[str, Any]:
+    """Read a JSON file"""
+    if orjson is not None:
+        return orjson.loads(Path(filepath).read_bytes())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+class JsonConfig:
+    """JSON file persistence shared by the settings dataclasses"""
+    
+    def save(self, filepath: str) -> None:
+        """Save settings to JSON file"""
+        # Every field is a plain number or string, so the instance dict can
+        # be written as is without asdict's deep copy
+        save_json(filepath, vars(self))
+    
+    @classmethod
+    def load(cls, filepath: str):
+        """Load settings from JSON file, or defaults if there is none"""
+        try:
+            return cls(**load_json(filepath))
+        except FileNotFoundError:
+            return cls()
+
+@njit(cache=True)
+def _pixel_distance(points, i, j, img_w, img_h):
+    """Distance between two normalized points after truncating them to whole pixels"""
+    return hypot(float(int(points[i, 0] * img_w) - int(points[j, 0] * img_w)),
+                 float(int(points[i, 1] * img_h) - int(points[j, 1] * img_h)))
+
+@njit(cache=True)
+def _eye_aspect_ratio(eye_points, img_w, img_h):
+    """Eye Aspect Ratio of 6 normalized eye points"""
+    # Vertical distances
+    A = _pixel_distance(eye_points, 1, 5, img_w, img_h)
+    B = _pixel_distance(eye_points, 2, 4, img_w, img_h)
+    # Horizontal distance
+    C = _pixel_distance(eye_points, 0, 3, img_w, img_h)
+    
+    if C == 0:
+        return 0.0
+    return (A + B) / (2.0 * C)
+
+@njit(cache=True)
+def _map_to_screen(nose_x, nose_y, mapping):
+    """Map a normalized nose position to screen pixels (mapping from mapping_constants)"""
+    min_x, max_x, min_y, max_y = mapping[0], mapping[1], mapping[2], mapping[3]
+    range_x, range_y, screen_w, screen_h = mapping[4], mapping[5], mapping[6], mapping[7]
+    
+    # Apply calibration bounds
+    bounded_x = max(min_x, min(max_x, nose_x))
+    bounded_y = max(min_y, min(max_y, nose_y))
+    
+    # Map to screen, truncated to whole pixels before the sensitivity is
+    # applied (the order the cursor has always been mapped in)
+    screen_x = int((bounded_x - min_x) / range_x * screen_w)
+    screen_y = int((bounded_y - min_y) / range_y * screen_h)
+    
+    # Apply sensitivity around the screen center
+    center_x, center_y = screen_w // 2, screen_h // 2
+    return (int(center_x + (screen_x - center_x) * mapping[8]),
+            int(center_y + (screen_y - center_y) * mapping[9]))
+
+@njit(cache=True)
+def _process_points(points, img_w, img_h, mapping):
+    """Average EAR and cursor target for one frame's eye and nose points"""
+    ear = (_eye_aspect_ratio(points[0:6], img_w, img_h) +
+           _eye_aspect_ratio(points[6:12], img_w, img_h)) / 2.0
+    screen_x, screen_y = _map_to_screen(points[12, 0], points[12, 1], mapping)
+    return ear, screen_x, screen_y
+
+def map_points_to_screen(points: np.ndarray, mapping: np.ndarray) -> np.ndarray:
+    """Map an (N, 2) array of normalized positions to screen pixels (_map_to_screen for many points)"""
+    bounded = np.clip(points, mapping[[0, 2]], mapping[[1, 3]])
+    screen = np.trunc((bounded - mapping[[0, 2]]) / mapping[[4, 5]] * mapping[[6, 7]])
+    center = mapping[[6, 7]] // 2
+    return (center + (screen - center) * mapping[[8, 9]]).astype(int)
+
 @dataclass
-class CalibrationData:
+class CalibrationData(JsonConfig):
     """Stores calibration data for cursor mapping"""
     center_x: float = 0.5
     center_y: float = 0.5
@@ -43,22 +159,14 @@ class CalibrationData:
     deadzone_px: int = 8
     smoothing_alpha: float = 0.25
     
-    def save(self, filepath: str) -> None:
-        """Save calibration data to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(asdict(self), f, indent=2)
-    
-    @classmethod
-    def load(cls, filepath: str) -> 'CalibrationData':
-        """Load calibration data from JSON file"""
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            return cls(**data)
-        return cls()
+    def mapping_constants(self, screen_w: int, screen_h: int) -> np.ndarray:
+        """Pack the cursor mapping for a screen size into one array, for the mapping kernel"""
+        return np.array([self.min_x, self.max_x, self.min_y, self.max_y,
+                         self.max_x - self.min_x, self.max_y - self.min_y, screen_w, screen_h,
+                         self.sensitivity_x, self.sensitivity_y], dtype=np.float64)
 
 @dataclass
-class BlinkConfig:
+class BlinkConfig(JsonConfig):
     """Configuration for blink detection"""
     single_blink_action: str = "left_click"
     double_blink_action: str = "double_click"
@@ -68,41 +176,81 @@ class BlinkConfig:
     click_cooldown: float = 0.5  # seconds
 
 class EyeMouseController:
-    def __init__(self):
+    # Overlay text style (colours are BGR)
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    EAR_COLOR = (255, 255, 0)
+    ACTION_COLOR = (0, 255, 0)
+    STATUS_TEXT = {False: ("Status: ACTIVE", (0, 255, 0)), True: ("Status: PAUSED", (0, 0, 255))}
+    HELP_TEXT = "ESC: Exit | SPACE: Pause/Resume | C: Calibrate"
+    
+    def __init__(self, calibration: Optional[CalibrationData] = None, show_preview: bool = True,
+                 face_mesh=None, cap=None):
         # Screen dimensions
         self.screen_w, self.screen_h = pyautogui.size()
         
-        # MediaPipe setup
+        # MediaPipe setup (imported here, as it is by far the slowest import
+        # and modules like config_gui only need the settings classes)
+        import mediapipe as mp
         self.mp_face = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # A FaceMesh and camera can be passed in to share them with the
+        # caller (e.g. the system tests) instead of opening new ones
+        if face_mesh is None:
+            face_mesh = self.mp_face.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=1,
+                # The eye corner/lid and nose landmarks used here are all in the
+                # base 468-point mesh, so the iris/lips refinement model is skipped
+                refine_landmarks=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        self.face_mesh = face_mesh
         self.mp_draw = mp.solutions.drawing_utils
         
+        # Face mesh overlay is cosmetic, so it is off by default (toggle
+        # with 'm') and draws the contours only, not the full tesselation
+        self.show_mesh = False
+        
+        # Camera preview, drawn and shown on every preview_stride-th frame
+        # (every frame while calibrating, for the on-screen instructions)
+        self.show_preview = show_preview
+        self.preview_stride = 2
+        self._mesh_spec = self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=1, circle_radius=1)
+        
         # Eye landmark indices for MediaPipe Face Mesh
         self.LEFT_EYE = [33, 160, 158, 133, 153, 144]
         self.RIGHT_EYE = [362, 385, 387, 263, 373, 380]
         self.NOSE_TIP = 1  # Nose tip landmark
         
-        # Calibration and settings
+        # Landmarks read out each frame, in this order: left eye (rows 0-5),
+        # right eye (rows 6-11) and nose tip (row 12)
+        self._needed_idx = self.LEFT_EYE + self.RIGHT_EYE + [self.NOSE_TIP]
+        
+        # Calibration and settings (a calibration passed in skips the file)
         self.calibration_file = "calibration.json"
-        self.calibration = CalibrationData.load(self.calibration_file)
+        if calibration is None:
+            calibration = CalibrationData.load(self.calibration_file)
+        self.calibration = calibration
         self.blink_config = BlinkConfig()
         
-        # Cursor tracking
+        # Mapping constants for the per-frame kernel; refreshed when
+        # calibration finishes. Running the kernel once here means it is
+        # compiled (or loaded from Numba's cache) before the first real frame.
+        self._recompute_mapping_constants()
+        _process_points(np.zeros((13, 2)), 640, 480, self._mapping)
+        
+        # Cursor tracking (the last position sent to the OS is tracked here
+        # rather than queried back every frame)
         self.smoothed_x = self.screen_w // 2
         self.smoothed_y = self.screen_h // 2
+        self._last_cursor = (self.screen_w // 2, self.screen_h // 2)
         
         # Blink detection
         self.blink_counter = 0
         self.last_blink_time = 0
         self.blink_start_time = 0
         self.last_click_time = 0
-        self.blink_history = []
+        self.blink_history = deque()
         
         # System state
         self.is_paused = False
@@ -111,13 +259,104 @@ class EyeMouseController:
         self.calibration_points = []
         
         # Camera setup
-        self.cap = cv2.VideoCapture(0)
+        self.cap = cap if cap is not None else cv2.VideoCapture(0)
+        # Keep only the newest frame queued so each one processed is fresh,
+        # and have the webcam compress frames itself (MJPG)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
+        # Face mesh inference runs on every inference_stride-th frame (always
+        # every frame while calibrating); frames in between reuse its result
+        self.inference_stride = 2
+        self._frame_idx = 0
+        self._last_results = None
+        self._last_points = None
+        
+        # Reused per-frame buffers for the mirrored frame and its RGB copy
+        self._flipped = np.empty((480, 640, 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._flipped)
+        
+        # Controls help text, rasterized once into a sprite for the
+        # bottom-right corner and blitted through its mask every frame
+        self._help_sprite, self._help_mask = self._render_help_sprite()
+        
+        # Capture thread state: the newest frame (a single slot that each
+        # capture overwrites), set when a frame is waiting to be processed
+        self._latest = None
+        # Capture buffers not in use: at most one is being filled, one waits
+        # in the slot and one is being processed, so three never run out
+        self._free_frames = [np.empty((480, 640, 3), dtype=np.uint8) for _ in range(3)]
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self._stop_capture = threading.Event()
+        self._capture_thread = None
+        self._capture_ended = False
+        
         # Logging setup
         self.setup_logging()
         
+    def _capture_loop(self):
+        """Capture frames on a background thread, keeping only the newest"""
+        try:
+            while not self._stop_capture.is_set():
+                with self._frame_lock:
+                    buf = self._free_frames.pop() if self._free_frames else None
+                # Decode into a free buffer (OpenCV replaces it if the camera
+                # ignored the requested resolution)
+                ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+                with self._frame_lock:
+                    if self._latest is not None:
+                        # The frame in the slot was never processed - reuse it
+                        self._free_frames.append(self._latest)
+                    # A failed read leaves the slot empty so run() stops
+                    self._latest = frame if ret else None
+                    self._frame_ready.set()
+                if not ret:
+                    break
+        finally:
+            # However the loop ends, leave the event set so read_latest_frame
+            # never waits for a frame that will not come
+            with self._frame_lock:
+                self._capture_ended = True
+                self._frame_ready.set()
+    
+    def start_capture(self):
+        """Start the background capture thread"""
+        self._stop_capture.clear()
+        self._capture_ended = False
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+    
+    def stop_capture(self):
+        """Stop the background capture thread, returning once it has exited"""
+        self._stop_capture.set()
+        if self._capture_thread is not None:
+            # No timeout: the thread may be inside cap.read(), and the camera
+            # must not be released under it
+            self._capture_thread.join()
+            self._capture_thread = None
+    
+    def read_latest_frame(self):
+        """Wait for the newest camera frame from the capture thread"""
+        # Frames captured while the previous one was processed were simply
+        # overwritten in the slot, so this is always the freshest one. There is
+        # no timeout, since some cameras take several seconds to open; a read
+        # failure or the capture thread exiting sets the event as well.
+        self._frame_ready.wait()
+        with self._frame_lock:
+            frame = self._latest
+            self._latest = None
+            if not self._capture_ended:
+                self._frame_ready.clear()
+        return frame is not None, frame
+    
+    def release_frame(self, frame):
+        """Hand a frame from read_latest_frame back for the capture thread to reuse"""
+        with self._frame_lock:
+            self._free_frames.append(frame)
+    
     def setup_logging(self):
         """Setup logging for debugging and performance monitoring"""
         logging.basicConfig(
@@ -130,21 +369,14 @@ class EyeMouseController:
         )
         self.logger = logging.getLogger(__name__)
         
-    def eye_aspect_ratio(self, landmarks, indices, img_w, img_h) -> float:
-        """Calculate Eye Aspect Ratio (EAR) for blink detection"""
-        pts = [(int(landmarks[i].x * img_w), int(landmarks[i].y * img_h)) for i in indices]
-        p1, p2, p3, p4, p5, p6 = pts
-        
-        # Vertical distances
-        A = np.linalg.norm(np.array(p2) - np.array(p6))
-        B = np.linalg.norm(np.array(p3) - np.array(p5))
-        # Horizontal distance
-        C = np.linalg.norm(np.array(p1) - np.array(p4))
-        
-        if C == 0:
-            return 0.0
-        ear = (A + B) / (2.0 * C)
-        return ear
+    def extract_points(self, landmarks) -> np.ndarray:
+        """Read the eye and nose landmarks into one array of normalized (x, y) rows"""
+        return np.fromiter((v for i in self._needed_idx for v in (landmarks[i].x, landmarks[i].y)),
+                           dtype=np.float64, count=2 * len(self._needed_idx)).reshape(-1, 2)
+    
+    def eye_aspect_ratio(self, eye_points: np.ndarray, img_w, img_h) -> float:
+        """Calculate Eye Aspect Ratio (EAR) for blink detection from 6 normalized eye points"""
+        return _eye_aspect_ratio(eye_points, img_w, img_h)
     
     def detect_blink(self, ear: float) -> Optional[str]:
         """Detect blinks and classify them based on duration and pattern"""
@@ -161,17 +393,18 @@ class EyeMouseController:
                 
                 # Check for double blink
                 self.blink_history.append(current_time)
-                self.blink_history = [t for t in self.blink_history if current_time - t < self.blink_config.double_blink_window]
+                while self.blink_history and current_time - self.blink_history[0] >= self.blink_config.double_blink_window:
+                    self.blink_history.popleft()
                 
                 if len(self.blink_history) >= 2:
                     action = self.blink_config.double_blink_action
-                    self.logger.info(f"Double blink detected: {action}")
+                    self.logger.info("Double blink detected: %s", action)
                 elif blink_duration > self.blink_config.long_blink_threshold:
                     action = self.blink_config.long_blink_action
-                    self.logger.info(f"Long blink detected: {action}")
+                    self.logger.info("Long blink detected: %s", action)
                 else:
                     action = self.blink_config.single_blink_action
-                    self.logger.info(f"Single blink detected: {action}")
+                    self.logger.info("Single blink detected: %s", action)
                 
                 self.blink_counter = 0
                 return action
@@ -196,21 +429,11 @@ class EyeMouseController:
     
     def map_to_screen(self, nose_x: float, nose_y: float) -> Tuple[int, int]:
         """Map normalized nose position to screen coordinates with calibration"""
-        # Apply calibration bounds
-        bounded_x = max(self.calibration.min_x, min(self.calibration.max_x, nose_x))
-        bounded_y = max(self.calibration.min_y, min(self.calibration.max_y, nose_y))
-        
-        # Map to screen with sensitivity adjustment
-        screen_x = int(((bounded_x - self.calibration.min_x) / 
-                       (self.calibration.max_x - self.calibration.min_x)) * self.screen_w)
-        screen_y = int(((bounded_y - self.calibration.min_y) / 
-                       (self.calibration.max_y - self.calibration.min_y)) * self.screen_h)
-        
-        # Apply sensitivity
-        screen_x = int(self.screen_w // 2 + (screen_x - self.screen_w // 2) * self.calibration.sensitivity_x)
-        screen_y = int(self.screen_h // 2 + (screen_y - self.screen_h // 2) * self.calibration.sensitivity_y)
-        
-        return screen_x, screen_y
+        return _map_to_screen(nose_x, nose_y, self._mapping)
+    
+    def _recompute_mapping_constants(self):
+        """Refresh the precomputed cursor mapping from the current calibration"""
+        self._mapping = self.calibration.mapping_constants(self.screen_w, self.screen_h)
     
     def smooth_cursor_movement(self, target_x: int, target_y: int) -> Tuple[int, int]:
         """Apply smoothing to cursor movement to reduce jitter"""
@@ -221,7 +444,7 @@ class EyeMouseController:
     
     def move_cursor(self, target_x: int, target_y: int):
         """Move cursor with deadzone and smoothing"""
-        current_x, current_y = pyautogui.position()
+        current_x, current_y = self._last_cursor
         
         # Apply deadzone
         if (abs(target_x - current_x) > self.calibration.deadzone_px or 
@@ -229,13 +452,15 @@ class EyeMouseController:
             
             # Apply smoothing
             smooth_x, smooth_y = self.smooth_cursor_movement(target_x, target_y)
-            pyautogui.moveTo(smooth_x, smooth_y, duration=0.01)
+            # Smoothing is already applied above, so move in one step
+            # without pyautogui's tween sleep or pause
+            pyautogui.moveTo(smooth_x, smooth_y, duration=0, _pause=False)
+            self._last_cursor = (smooth_x, smooth_y)
     
-    def process_calibration(self, frame, landmarks):
+    def process_calibration(self, frame, points):
         """Handle calibration process"""
         h, w = frame.shape[:2]
-        nose = landmarks[self.NOSE_TIP]
-        nose_x, nose_y = nose.x, nose.y
+        nose_x, nose_y = points[12].tolist()
         
         instructions = [
             "Look at center of screen and press SPACE",
@@ -249,9 +474,9 @@ class EyeMouseController:
         if self.calibration_step < len(instructions):
             # Display instruction
             cv2.putText(frame, f"Calibration Step {self.calibration_step + 1}/6", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                       (10, 30), self.FONT, 0.7, (0, 255, 0), 2)
             cv2.putText(frame, instructions[self.calibration_step], 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                       (10, 60), self.FONT, 0.6, (255, 255, 255), 2)
             
             # Store calibration points
             if self.calibration_step == 0:  # Center
@@ -271,8 +496,8 @@ class EyeMouseController:
                 self.calibration.max_y = max(self.calibration.max_y, nose_y)
             elif self.calibration_step == 5:  # Blink calibration
                 # Auto-calibrate EAR threshold based on blinks
-                left_ear = self.eye_aspect_ratio(landmarks, self.LEFT_EYE, w, h)
-                right_ear = self.eye_aspect_ratio(landmarks, self.RIGHT_EYE, w, h)
+                left_ear = self.eye_aspect_ratio(points[:6], w, h)
+                right_ear = self.eye_aspect_ratio(points[6:12], w, h)
                 avg_ear = (left_ear + right_ear) / 2
                 
                 # Collect EAR values during blinks for threshold calibration
@@ -281,112 +506,153 @@ class EyeMouseController:
                 else:
                     self.blink_ear_values = [avg_ear]
     
-    def draw_visualization(self, frame, face_landmark_obj, ear: float, blink_action: Optional[str]):
+    def _render_help_sprite(self):
+        """Rasterize the controls help text into a 40x400 sprite and its mask"""
+        sprite = np.zeros((40, 400, 3), dtype=np.uint8)
+        cv2.putText(sprite, self.HELP_TEXT, (0, 20), self.FONT, 0.5, (200, 200, 200), 1)
+        return sprite, sprite.any(axis=2, keepdims=True)
+    
+    def draw_visualization(self, frame, face_landmark_obj, points, ear: float, blink_action: Optional[str]):
         """Draw visual feedback on frame"""
         h, w = frame.shape[:2]
         
-        # Extract landmarks from the face landmark object
-        landmarks = face_landmark_obj.landmark
-        
-        # Draw face mesh
         if face_landmark_obj:
-            self.mp_draw.draw_landmarks(
-                frame, 
-                face_landmark_obj, 
-                self.mp_face.FACEMESH_TESSELATION,
-                landmark_drawing_spec=None,
-                connection_drawing_spec=self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=1, circle_radius=1)
-            )
+            # Draw face mesh
+            if self.show_mesh:
+                self.mp_draw.draw_landmarks(
+                    frame, 
+                    face_landmark_obj, 
+                    self.mp_face.FACEMESH_CONTOURS,
+                    landmark_drawing_spec=None,
+                    connection_drawing_spec=self._mesh_spec
+                )
+            
+            # Pixel positions of the eye points and the nose tip
+            pixel_pts = [tuple(pt) for pt in (points * (w, h)).astype(int).tolist()]
             
             # Draw nose indicator
-            nose = landmarks[self.NOSE_TIP]
-            nose_pos = (int(nose.x * w), int(nose.y * h))
+            nose_pos = pixel_pts[12]
             cv2.circle(frame, nose_pos, 8, (0, 255, 255), -1)
             cv2.circle(frame, nose_pos, 12, (0, 255, 255), 2)
             
             # Draw eye indicators
-            left_eye_pts = [(int(landmarks[i].x * w), int(landmarks[i].y * h)) for i in self.LEFT_EYE]
-            right_eye_pts = [(int(landmarks[i].x * w), int(landmarks[i].y * h)) for i in self.RIGHT_EYE]
-            
-            for pts in [left_eye_pts, right_eye_pts]:
-                for pt in pts:
-                    cv2.circle(frame, pt, 3, (255, 0, 0), -1)
+            for pt in pixel_pts[:12]:
+                cv2.circle(frame, pt, 3, (255, 0, 0), -1)
         
-        # Status overlay
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 80), (0, 0, 0), -1)
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+        # Status overlay: dim the top bar in place (a 30% blend with black)
+        bar = frame[:80]
+        cv2.addWeighted(bar, 0.7, bar, 0.0, 0, dst=bar)
         
-        # Display status information
-        status_color = (0, 255, 0) if not self.is_paused else (0, 0, 255)
-        cv2.putText(frame, f"EAR: {ear:.3f}", (10, 25), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+        # Display status information, drawn only into the bar's corner
+        text_roi = frame[:80, :320]
+        font = self.FONT
+        cv2.putText(text_roi, "EAR: %.3f" % ear, (10, 25), font, 0.6, self.EAR_COLOR, 2)
         
         if blink_action:
-            cv2.putText(frame, f"Action: {blink_action}", (10, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            cv2.putText(text_roi, "Action: " + blink_action, (10, 50), font, 0.6, self.ACTION_COLOR, 2)
         
-        status_text = "PAUSED" if self.is_paused else "ACTIVE"
-        cv2.putText(frame, f"Status: {status_text}", (10, 75), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, status_color, 2)
+        status_text, status_color = self.STATUS_TEXT[self.is_paused]
+        cv2.putText(text_roi, status_text, (10, 75), font, 0.6, status_color, 2)
         
-        # Controls help
-        help_text = "ESC: Exit | SPACE: Pause/Resume | C: Calibrate"
-        cv2.putText(frame, help_text, (w - 400, h - 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        # Controls help, anchored to the bottom-right corner; on a frame
+        # smaller than the sprite its top/left edges are cut off, as
+        # off-frame text would be
+        rows = min(h, self._help_sprite.shape[0])
+        cols = min(w, self._help_sprite.shape[1])
+        np.copyto(frame[h - rows:, w - cols:], self._help_sprite[-rows:, -cols:],
+                  where=self._help_mask[-rows:, -cols:])
         
         return frame
     
+    def show_controls_window(self):
+        """Show just the controls help, so hotkeys still work without a preview"""
+        cv2.imshow("Eye Mouse Control", self._help_sprite)
+    
     def run(self):
         """Main application loop"""
         self.logger.info("Starting Eye Mouse Control")
+        self.start_capture()
+        if not self.show_preview:
+            self.show_controls_window()
+        
+        # pollKey (OpenCV 4.5+) handles window events like waitKey does, but
+        # returns straight away instead of sleeping for at least 1 ms
+        poll_key = getattr(cv2, "pollKey", None)
         
         while True:
-            ret, frame = self.cap.read()
+            ret, frame = self.read_latest_frame()
             if not ret:
                 self.logger.error("Camera not available")
                 break
             
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
+            if frame.shape != self._flipped.shape:
+                # Camera ignored the requested resolution
+                self._flipped = np.empty_like(frame)
+                self._rgb = np.empty_like(frame)
+            
+            # Flip frame horizontally for mirror effect; the flipped copy is
+            # all that is used from here on, so the capture buffer goes back
+            captured = frame
+            frame = cv2.flip(captured, 1, dst=self._flipped)
+            self.release_frame(captured)
             h, w = frame.shape[:2]
             
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb_frame)
+            frame_idx = self._frame_idx
+            self._frame_idx += 1
+            
+            stride = 1 if self.is_calibrating else self.inference_stride
+            inferred = self._last_results is None or frame_idx % stride == 0
+            if inferred:
+                # Convert to RGB for MediaPipe
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+                
+                # A read-only image lets MediaPipe use it without copying (it is
+                # made writable again since OpenCV refuses read-only dst arrays)
+                rgb_frame.flags.writeable = False
+                results = self.face_mesh.process(rgb_frame)
+                rgb_frame.flags.writeable = True
+                
+                # Read the landmarks we use out of MediaPipe once per inference
+                points = None
+                if results.multi_face_landmarks:
+                    points = self.extract_points(results.multi_face_landmarks[0].landmark)
+                self._last_results, self._last_points = results, points
+            else:
+                # Skipped frame - carry the last landmarks forward
+                results, points = self._last_results, self._last_points
             
             blink_action = None
             ear = 0.0
             
             if results.multi_face_landmarks and not self.is_paused:
-                landmarks = results.multi_face_landmarks[0].landmark
-                
                 if self.is_calibrating:
-                    self.process_calibration(frame, landmarks)
-                else:
-                    # Calculate EAR for blink detection
-                    left_ear = self.eye_aspect_ratio(landmarks, self.LEFT_EYE, w, h)
-                    right_ear = self.eye_aspect_ratio(landmarks, self.RIGHT_EYE, w, h)
-                    ear = (left_ear + right_ear) / 2.0
+                    self.process_calibration(frame, points)
+                elif inferred:
+                    # EAR for blink detection and the nose's cursor target,
+                    # computed together in one kernel call (fresh landmarks
+                    # only, since carried-forward ones would make detect_blink
+                    # count one low EAR reading twice)
+                    ear, target_x, target_y = _process_points(points, w, h, self._mapping)
                     
                     # Detect blinks
                     blink_action = self.detect_blink(ear)
                     if blink_action:
                         self.execute_click_action(blink_action)
                     
-                    # Map nose position to cursor
-                    nose = landmarks[self.NOSE_TIP]
-                    target_x, target_y = self.map_to_screen(nose.x, nose.y)
+                    # Move cursor to the nose position
                     self.move_cursor(target_x, target_y)
             
-            # Draw visualization
-            if results.multi_face_landmarks:
-                frame = self.draw_visualization(frame, results.multi_face_landmarks[0], ear, blink_action)
-            
-            cv2.imshow("Eye Mouse Control", frame)
+            # Both strides count the same frame index, so with equal strides
+            # the preview lands on the frames whose landmarks are fresh
+            if self.is_calibrating or (self.show_preview and frame_idx % self.preview_stride == 0):
+                # Draw visualization
+                if results.multi_face_landmarks:
+                    frame = self.draw_visualization(frame, results.multi_face_landmarks[0], points, ear, blink_action)
+                
+                cv2.imshow("Eye Mouse Control", frame)
             
             # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
+            key = (poll_key() if poll_key is not None else cv2.waitKey(1)) & 0xFF
             if key == 27:  # ESC
                 break
             elif key == 32:  # SPACE
@@ -396,22 +662,33 @@ class EyeMouseController:
                         # Finish calibration
                         self.is_calibrating = False
                         self.calibration.save(self.calibration_file)
+                        self._recompute_mapping_constants()
+                        if not self.show_preview:
+                            self.show_controls_window()
                         self.logger.info("Calibration completed and saved")
                         self.calibration_step = 0
                 else:
                     self.is_paused = not self.is_paused
-                    self.logger.info(f"System {'paused' if self.is_paused else 'resumed'}")
+                    self.logger.info("System %s", "paused" if self.is_paused else "resumed")
             elif key == ord('c'):  # Start calibration
                 self.is_calibrating = True
                 self.calibration_step = 0
                 self.blink_ear_values = []
                 self.logger.info("Starting calibration process")
+            elif key == ord('m'):  # Toggle face mesh overlay
+                self.show_mesh = not self.show_mesh
         
         # Cleanup
+        self.stop_capture()
         self.cap.release()
         cv2.destroyAllWindows()
         self.logger.info("Eye Mouse Control stopped")
 
 if __name__ == "__main__":
-    controller = EyeMouseController()
+    parser = argparse.ArgumentParser(description="Hands-free cursor control using face tracking and blink detection")
+    parser.add_argument("--no-preview", action="store_true",
+                        help="hide the camera preview (a small controls window keeps the hotkeys working)")
+    args = parser.parse_args()
+    
+    controller = EyeMouseController(show_preview=not args.no_preview)
     controller.run()
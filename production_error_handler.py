@@ -45,7 +45,7 @@ class ProductionErrorHandler:
         
         # Create logger
         self.logger = logging.getLogger(self.app_name)
-        self.logger.info(f"=== {self.app_name} v1.0.0 Started ===")
+        self.logger.info("=== %s v1.0.0 Started ===", self.app_name)
         
     def setup_crash_handler(self):
         """Setup global exception handler"""
@@ -116,13 +116,17 @@ Please report this issue to our support team.
         # Run in separate thread to avoid blocking
         threading.Thread(target=show_dialog, daemon=True).start()
         
-    def log_error(self, error, context=""):
+    def log_error(self, error, context="", exc_info=False):
         """Log an error with context"""
-        self.logger.error(f"Error in {context}: {str(error)}", exc_info=True)
+        self.logger.error("Error in %s: %s", context, error, exc_info=exc_info)
+        
+    def log_exception(self, error, context=""):
+        """Log an error with context and the traceback of the exception being handled"""
+        self.log_error(error, context, exc_info=True)
         
     def log_warning(self, message, context=""):
         """Log a warning message"""
-        self.logger.warning(f"Warning in {context}: {message}")
+        self.logger.warning("Warning in %s: %s", context, message)
         
     def log_info(self, message):
         """Log an info message"""
@@ -141,7 +145,7 @@ Please report this issue to our support team.
             file_age = current_time - log_file.stat().st_mtime
             if file_age > days_to_keep * 24 * 3600:  # Convert days to seconds
                 log_file.unlink()
-                self.logger.info(f"Deleted old log file: {log_file}")
+                self.logger.info("Deleted old log file: %s", log_file)
 
 # Global error handler instance
 error_handler = None
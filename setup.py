@@ -55,8 +55,9 @@ setup(
             "flake8>=4.0",
             "mypy>=0.900",
         ],
-        "gpu": [
-            "mediapipe-gpu",
+        "speed": [
+            "numba>=0.57",
+            "orjson>=3.6",
         ],
     },
     project_urls={
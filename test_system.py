@@ -9,18 +9,20 @@ import numpy as np
 import time
 import json
 import logging
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-import matplotlib.pyplot as plt
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 import sys
-import os
 
-# Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - the standard library writes the same files
+    orjson = None
 
-from eye_mouse_control import EyeMouseController, CalibrationData
-from advanced_filters import MultiFilterPipeline
+from eye_mouse_control import EyeMouseController, CalibrationData, map_points_to_screen
+from advanced_filters import MultiFilterPipeline, count_blinks
 
 @dataclass
 class TestResults:
@@ -43,8 +45,15 @@ class SystemTester:
         self.logger = self.setup_logging()
         self.test_results = []
         
+        # Every result of this suite run is stamped with its start time
+        self._suite_ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        
         # Camera setup
         self.cap = cv2.VideoCapture(0)
+        # Keep only the newest frame queued so the measurements see the live
+        # scene, and have the webcam compress frames itself (MJPG)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
@@ -53,11 +62,16 @@ class SystemTester:
         self.face_mesh = self.mp_face.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
-            refine_landmarks=True,
+            # Same configuration as the controller, which only needs the
+            # base mesh and skips the iris/lips refinement model
+            refine_landmarks=False,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         
+        # Reused RGB buffer for the frames passed to MediaPipe
+        self._rgb = np.empty((480, 640, 3), dtype=np.uint8)
+        
         # Eye landmarks
         self.LEFT_EYE = [33, 160, 158, 133, 153, 144]
         self.RIGHT_EYE = [362, 385, 387, 263, 373, 380]
@@ -69,30 +83,46 @@ class SystemTester:
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler('test_results.log'),
+                # Bounded log that is only opened once something is logged
+                RotatingFileHandler('test_results.log', maxBytes=1 << 20, backupCount=3, delay=True),
                 logging.StreamHandler()
             ]
         )
         return logging.getLogger(__name__)
     
+    def _drain(self, n=5):
+        """Discard frames queued in the camera since it was last read"""
+        # Not every backend honours CAP_PROP_BUFFERSIZE, so frames left over
+        # from before a test could otherwise be measured as part of it
+        for _ in range(n):
+            self.cap.grab()
+    
     def test_camera_performance(self) -> TestResults:
         """Test camera performance and frame rate"""
         self.logger.info("Testing camera performance...")
+        self._drain()
         
         frame_count = 0
-        start_time = time.time()
         test_duration = 10.0  # 10 seconds
+        deadline = time.perf_counter_ns() + int(test_duration * 1e9)
         
-        while time.time() - start_time < test_duration:
-            ret, frame = self.cap.read()
+        # Frames are decoded into two reused slots instead of a new array each
+        frames = np.empty((2, 480, 640, 3), dtype=np.uint8)
+        slot = 0
+        
+        while time.perf_counter_ns() < deadline:
+            if not self.cap.grab():
+                continue
+            ret, frame = self.cap.retrieve(frames[slot])
             if ret:
                 frame_count += 1
+                slot ^= 1
         
         fps = frame_count / test_duration
         
         results = TestResults(
             test_name="Camera Performance",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=self._suite_ts,
             fps=fps,
             latency_ms=0,
             accuracy_pixels=0,
@@ -109,15 +139,20 @@ class SystemTester:
     def test_face_detection(self) -> TestResults:
         """Test face detection accuracy and speed"""
         self.logger.info("Testing face detection...")
+        self._drain()
         
         detection_count = 0
         total_frames = 0
-        processing_times = []
         
-        start_time = time.time()
+        # Running mean and sum of squared deviations of the processing time
+        # (Welford's method), so nothing grows with the test duration
+        avg_processing_time = 0.0
+        processing_m2 = 0.0
+        
         test_duration = 10.0
+        deadline = time.perf_counter_ns() + int(test_duration * 1e9)
         
-        while time.time() - start_time < test_duration:
+        while time.perf_counter_ns() < deadline:
             ret, frame = self.cap.read()
             if not ret:
                 continue
@@ -125,21 +160,31 @@ class SystemTester:
             total_frames += 1
             
             # Process frame
-            process_start = time.time()
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            process_start = time.perf_counter_ns()
+            if frame.shape != self._rgb.shape:
+                # Camera ignored the requested resolution
+                self._rgb = np.empty_like(frame)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            
+            # A read-only image lets MediaPipe use it without copying (it is
+            # made writable again since OpenCV refuses read-only dst arrays)
+            rgb_frame.flags.writeable = False
             results = self.face_mesh.process(rgb_frame)
-            process_time = time.time() - process_start
-            processing_times.append(process_time)
+            rgb_frame.flags.writeable = True
+            process_time = (time.perf_counter_ns() - process_start) / 1e9
+            delta = process_time - avg_processing_time
+            avg_processing_time += delta / total_frames
+            processing_m2 += delta * (process_time - avg_processing_time)
             
             if results.multi_face_landmarks:
                 detection_count += 1
         
         detection_rate = detection_count / total_frames if total_frames > 0 else 0
-        avg_processing_time = np.mean(processing_times) if processing_times else 0
+        std_processing_time = (processing_m2 / total_frames) ** 0.5 if total_frames > 0 else 0
         
         results = TestResults(
             test_name="Face Detection",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=self._suite_ts,
             fps=0,
             latency_ms=avg_processing_time * 1000,
             accuracy_pixels=detection_rate * 100,
@@ -147,7 +192,7 @@ class SystemTester:
             false_negative_rate=(1 - detection_rate) * 100,
             system_info={"total_frames": total_frames, "detections": detection_count},
             passed=detection_rate >= 0.9,  # Target: 90% detection rate
-            details={"avg_processing_time": avg_processing_time}
+            details={"avg_processing_time": avg_processing_time, "std_processing_time": std_processing_time}
         )
         
         self.logger.info(f"Face detection rate: {detection_rate*100:.1f}% - {'PASS' if results.passed else 'FAIL'}")
@@ -158,38 +203,19 @@ class SystemTester:
         self.logger.info("Testing blink detection accuracy...")
         
         # Simulate EAR values
-        normal_ear_values = np.random.normal(0.25, 0.02, 100)  # Normal eye state
-        blink_ear_values = np.random.normal(0.15, 0.02, 50)    # Blink state
+        rng = np.random.default_rng(0)
+        normal_ear_values = rng.normal(0.25, 0.02, 100)  # Normal eye state
+        blink_ear_values = rng.normal(0.15, 0.02, 50)    # Blink state
         
         # Test thresholds
         ear_threshold = 0.21
         consecutive_frames = 2
         
         # Test normal state (should not detect blinks)
-        false_positives = 0
-        blink_counter = 0
-        
-        for ear in normal_ear_values:
-            if ear < ear_threshold:
-                blink_counter += 1
-                if blink_counter >= consecutive_frames:
-                    false_positives += 1
-                    blink_counter = 0
-            else:
-                blink_counter = 0
+        false_positives = count_blinks(normal_ear_values, ear_threshold, consecutive_frames)
         
         # Test blink state (should detect blinks)
-        true_positives = 0
-        blink_counter = 0
-        
-        for ear in blink_ear_values:
-            if ear < ear_threshold:
-                blink_counter += 1
-                if blink_counter >= consecutive_frames:
-                    true_positives += 1
-                    blink_counter = 0
-            else:
-                blink_counter = 0
+        true_positives = count_blinks(blink_ear_values, ear_threshold, consecutive_frames)
         
         false_positive_rate = false_positives / len(normal_ear_values)
         true_positive_rate = true_positives / len(blink_ear_values)
@@ -197,7 +223,7 @@ class SystemTester:
         
         results = TestResults(
             test_name="Blink Detection Accuracy",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=self._suite_ts,
             fps=0,
             latency_ms=0,
             accuracy_pixels=true_positive_rate * 100,
@@ -237,32 +263,23 @@ class SystemTester:
         ]
         
         screen_w, screen_h = 1920, 1080  # Assume full HD
-        mapping_errors = []
+        points = np.array(test_points)
         
-        for nx, ny in test_points:
-            # Expected screen position
-            expected_x = int(nx * screen_w)
-            expected_y = int(ny * screen_h)
-            
-            # Actual mapping (using controller logic)
-            bounded_x = max(calibration.min_x, min(calibration.max_x, nx))
-            bounded_y = max(calibration.min_y, min(calibration.max_y, ny))
-            
-            actual_x = int(((bounded_x - calibration.min_x) / 
-                           (calibration.max_x - calibration.min_x)) * screen_w)
-            actual_y = int(((bounded_y - calibration.min_y) / 
-                           (calibration.max_y - calibration.min_y)) * screen_h)
-            
-            # Calculate error
-            error = np.sqrt((actual_x - expected_x)**2 + (actual_y - expected_y)**2)
-            mapping_errors.append(error)
+        # Expected screen positions
+        expected = (points * (screen_w, screen_h)).astype(int)
+        
+        # Actual mapping (the controller's mapping, for all points at once)
+        actual = map_points_to_screen(points, calibration.mapping_constants(screen_w, screen_h))
+        
+        # Calculate errors
+        mapping_errors = np.hypot(*(actual - expected).T)
         
         avg_error = np.mean(mapping_errors)
         max_error = np.max(mapping_errors)
         
         results = TestResults(
             test_name="Cursor Mapping",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=self._suite_ts,
             fps=0,
             latency_ms=0,
             accuracy_pixels=avg_error,
@@ -283,7 +300,7 @@ class SystemTester:
         pipeline = MultiFilterPipeline()
         
         # Generate noisy test data
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         test_size = 1000
         
         # Base trajectory (circle)
@@ -293,24 +310,17 @@ class SystemTester:
         
         # Add noise
         noise_level = 0.05
-        noisy_x = base_x + np.random.normal(0, noise_level, test_size)
-        noisy_y = base_y + np.random.normal(0, noise_level, test_size)
-        
-        # Measure filtering time
-        start_time = time.time()
-        filtered_points = []
-        
-        for i in range(test_size):
-            fx, fy = pipeline.filter_cursor_position(noisy_x[i], noisy_y[i])
-            filtered_points.append((fx, fy))
-        
-        filtering_time = time.time() - start_time
+        noisy_x = base_x + rng.standard_normal(test_size) * noise_level
+        noisy_y = base_y + rng.standard_normal(test_size) * noise_level
+        
+        # Measure filtering time, replaying the trajectory at 30 FPS in one
+        # batch call
+        frame_interval = 1.0 / 30
+        start_time = time.perf_counter_ns()
+        filtered_x, filtered_y = pipeline.filter_cursor_position_batch(noisy_x, noisy_y, frame_interval)
+        filtering_time = (time.perf_counter_ns() - start_time) / 1e9
         avg_filtering_time = filtering_time / test_size
         
-        # Calculate smoothing effectiveness
-        filtered_x = [p[0] for p in filtered_points]
-        filtered_y = [p[1] for p in filtered_points]
-        
         # Calculate variance reduction
         original_variance = np.var(noisy_x) + np.var(noisy_y)
         filtered_variance = np.var(filtered_x) + np.var(filtered_y)
@@ -318,7 +328,7 @@ class SystemTester:
         
         results = TestResults(
             test_name="Filtering Performance",
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=self._suite_ts,
             fps=0,
             latency_ms=avg_filtering_time * 1000,
             accuracy_pixels=variance_reduction * 100,
@@ -342,8 +352,9 @@ class SystemTester:
         self.logger.info("Testing system integration...")
         
         try:
-            # Try to create controller
-            controller = EyeMouseController()
+            # Try to create controller, sharing this suite's camera and
+            # FaceMesh rather than opening a second camera handle and graph
+            controller = EyeMouseController(face_mesh=self.face_mesh, cap=self.cap)
             
             # Test calibration loading
             calibration = CalibrationData.load("calibration.json")
@@ -351,17 +362,16 @@ class SystemTester:
             # Test basic functionality
             test_ear = 0.15
             test_threshold = 0.21
-            ear_result = controller.eye_aspect_ratio(
-                controller.face_mesh.FaceMesh()._landmarks, 
-                controller.LEFT_EYE, 
-                640, 480
-            ) if hasattr(controller, 'face_mesh') else 0.2
+            # Synthetic open eye, as normalized points in LEFT_EYE order
+            open_eye = np.array([[0.40, 0.50], [0.42, 0.48], [0.44, 0.48],
+                                 [0.46, 0.50], [0.44, 0.52], [0.42, 0.52]])
+            ear_result = controller.eye_aspect_ratio(open_eye, 640, 480)
             
             integration_score = 100  # All components loaded successfully
             
             results = TestResults(
                 test_name="System Integration",
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+                timestamp=self._suite_ts,
                 fps=0,
                 latency_ms=0,
                 accuracy_pixels=integration_score,
@@ -369,14 +379,14 @@ class SystemTester:
                 false_negative_rate=0,
                 system_info={"components_loaded": True},
                 passed=True,
-                details={"controller_created": True, "calibration_loaded": True}
+                details={"controller_created": True, "calibration_loaded": True, "ear": ear_result}
             )
             
         except Exception as e:
             self.logger.error(f"Integration test failed: {e}")
             results = TestResults(
                 test_name="System Integration",
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+                timestamp=self._suite_ts,
                 fps=0,
                 latency_ms=0,
                 accuracy_pixels=0,
@@ -484,8 +494,13 @@ class SystemTester:
                 'details': result.details
             })
         
-        with open(filename, 'w') as f:
-            json.dump(results_data, f, indent=2)
+        # The results hold NumPy scalars (means, comparisons against them),
+        # which each encoder is told how to write
+        if orjson is not None:
+            content = orjson.dumps(results_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            content = json.dumps(results_data, indent=2, default=lambda value: value.item()).encode()
+        Path(filename).write_bytes(content)
         
         self.logger.info(f"Test results saved to {filename}")
     
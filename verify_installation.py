@@ -2,58 +2,153 @@
 Installation verification script for Eye Mouse Control
 """
 
-import subprocess
 import sys
 import os
+import json
+import hashlib
+import re
+from pathlib import Path
+from importlib.machinery import PathFinder
+import importlib.metadata
+from functools import lru_cache
+
+# Oldest supported Python
+_MIN_PY = (3, 9)
+
+# Import names of packages whose metadata can't tell us (Python 3.9 has no
+# packages_distributions(), and uninstalled packages have no metadata)
+_IMPORT_NAME_FALLBACK = {'opencv-python': 'cv2', 'pillow': 'PIL', 'tkinter-tooltip': 'tktooltip'}
+
+# Most dependency probes run at once
+_MAX_PROBE_WORKERS = 8
+
+# Import names already found missing in this process
+_missing_modules = set()
+
+# Status symbols, falling back to ASCII where stdout can't encode emoji
+# (e.g. a legacy Windows console code page)
+if (sys.stdout.encoding or '').lower().replace('-', '').startswith('utf'):
+    _OK, _BAD, _PARTY, _WARN = '✅', '❌', '🎉', '⚠️'
+else:
+    _OK, _BAD, _PARTY, _WARN = '[OK]', '[X]', '[*]', '[!]'
+
+# Last successful Python and dependency check, reused while its key matches
+CACHE_FILE = Path.home() / ".cache" / "eye_mouse_control" / "verify.json"
+
+# Hash of the requirements.txt last verified with --fast: kept in the
+# project's virtualenv when it has one, otherwise next to CACHE_FILE
+VENV_STAMP_FILE = Path(".venv") / ".verify_stamp"
+CACHE_STAMP_FILE = CACHE_FILE.parent / "verify_stamp"
 
 def check_python_version():
-    """Check Python version"""
-    version = sys.version_info
-    if version >= (3, 9):
-        print(f"✅ Python {version.major}.{version.minor}.{version.micro} (OK)")
-        return True
-    else:
-        print(f"❌ Python {version.major}.{version.minor}.{version.micro} (Need 3.9+)")
-        return False
+    """Check Python version, returning the result and its report lines"""
+    v = sys.version_info
+    ok = v >= _MIN_PY
+    status = "OK" if ok else "Need %d.%d+" % _MIN_PY
+    return ok, [f"{_OK if ok else _BAD} Python {v.major}.{v.minor}.{v.micro} ({status})"]
+
+def _canonical_name(name):
+    """Normalize a distribution name for comparison (PEP 503)"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+@lru_cache(maxsize=1)
+def _installed_import_names():
+    """Map each installed distribution's canonical name to its top-level import name"""
+    packages_distributions = getattr(importlib.metadata, 'packages_distributions', None)
+    if packages_distributions is None:
+        return {}
+    
+    # One sweep over the installed metadata, inverted; where a distribution
+    # ships several top-level names, prefer the one matching its own name
+    names = {}
+    for top_level, distributions in packages_distributions().items():
+        for distribution in distributions:
+            dist = _canonical_name(distribution)
+            if dist not in names or _canonical_name(top_level) == dist:
+                names[dist] = top_level
+    return names
+
+def import_name_for(package):
+    """Return the name a distribution is imported by"""
+    dist = _canonical_name(package)
+    return _installed_import_names().get(dist) or _IMPORT_NAME_FALLBACK.get(dist, package)
+
+def probe_package(package):
+    """Return (package, installed, version) for a distribution"""
+    import_name = import_name_for(package)
+    
+    if import_name in _missing_modules:
+        return package, False, None
+    
+    module = sys.modules.get(import_name)
+    if module is None:
+        # find_spec and the installed metadata answer this without running any
+        # package's top-level code (importing MediaPipe or OpenCV takes seconds).
+        # The dependencies are all installed on sys.path, so ask PathFinder
+        # directly instead of walking every finder on sys.meta_path
+        if PathFinder.find_spec(import_name) is None:
+            _missing_modules.add(import_name)
+            return package, False, None
+    elif getattr(module, '__version__', None) is not None:
+        # Already imported by whatever is running this check
+        return package, True, module.__version__
+    
+    try:
+        version = importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    return package, True, version
+
+def read_requirements(path='requirements.txt'):
+    """Return the distribution names listed in a requirements file"""
+    packages = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            # Skip blanks and pip options such as -r or --index-url
+            if line and not line.startswith('-'):
+                packages.append(re.split(r'[<>=!~;\[\s]', line, 1)[0])
+    return packages
 
 def check_dependencies():
-    """Check if all dependencies are installed"""
-    print("\nChecking dependencies...")
-    
-    required_packages = [
-        'opencv-python',
-        'mediapipe', 
-        'numpy',
-        'pyautogui',
-        'pynput',
-        'scipy',
-        'pillow',
-        'matplotlib'
-    ]
+    """Check if all dependencies are installed, returning the result and its report lines"""
+    lines = ["\nChecking dependencies..."]
+    
+    # requirements.txt is the one list of what the project needs
+    try:
+        required_packages = read_requirements()
+    except OSError:
+        lines.append(f"{_BAD} requirements.txt - MISSING")
+        return False, lines
+    
+    if not required_packages:
+        # Nothing listed, so nothing can be missing
+        return True, lines
+    
+    # Build the distribution -> import name map once, before the probes share it
+    _installed_import_names()
     
     all_ok = True
     
-    for package in required_packages:
-        try:
-            if package == 'opencv-python':
-                import cv2
-                print(f"✅ {package} - {cv2.__version__}")
-            elif package == 'pillow':
-                import PIL
-                print(f"✅ {package} - {PIL.__version__}")
-            else:
-                module = __import__(package)
-                version = getattr(module, '__version__', 'unknown')
-                print(f"✅ {package} - {version}")
-        except ImportError:
-            print(f"❌ {package} - NOT INSTALLED")
+    # The probes are mostly filesystem lookups, so run them side by side and
+    # report in the listed order (imported here, since a cached result skips
+    # this check entirely)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(_MAX_PROBE_WORKERS, len(required_packages))) as executor:
+        results = list(executor.map(probe_package, required_packages))
+    
+    for package, ok, version in results:
+        if ok:
+            lines.append(f"{_OK} {package} - {version}")
+        else:
+            lines.append(f"{_BAD} {package} - NOT INSTALLED")
             all_ok = False
     
-    return all_ok
+    return all_ok, lines
 
 def check_files():
-    """Check if all required files exist"""
-    print("\nChecking project files...")
+    """Check if all required files exist, returning the result and its report lines"""
+    lines = ["\nChecking project files..."]
     
     required_files = [
         'eye_mouse_control.py',
@@ -68,82 +163,190 @@ def check_files():
         'quick_test.py'
     ]
     
-    all_ok = True
+    # One directory listing instead of a stat per file; normcase makes the
+    # names compare case-insensitively on Windows, as os.path.exists does
+    missing = set(map(os.path.normcase, required_files)) - set(map(os.path.normcase, os.listdir('.')))
     
     for file in required_files:
-        if os.path.exists(file):
-            print(f"✅ {file}")
+        if os.path.normcase(file) in missing:
+            lines.append(f"{_BAD} {file} - MISSING")
         else:
-            print(f"❌ {file} - MISSING")
-            all_ok = False
+            lines.append(f"{_OK} {file}")
     
-    return all_ok
+    return not missing, lines
 
 def install_missing():
     """Install missing dependencies"""
+    # Only needed on this failure path, so not imported up front
+    import subprocess
+    
     print("\nInstalling missing dependencies...")
     
     try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-        print("✅ Dependencies installed successfully")
+        # Skip pip's self-update check, never wait for a prompt, and take
+        # wheels over source builds whenever a wheel exists
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install',
+                               '--disable-pip-version-check', '--no-input', '--prefer-binary',
+                               '-r', 'requirements.txt'])
+        print(f"{_OK} Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError:
-        print("❌ Failed to install dependencies")
+        print(f"{_BAD} Failed to install dependencies")
+        return False
+
+def cache_key():
+    """Key for a cached result: the interpreter and the requirements it was checked against"""
+    try:
+        requirements_mtime = os.stat('requirements.txt').st_mtime_ns
+    except OSError:
+        requirements_mtime = None
+    return hashlib.sha1(f"{sys.executable}|{requirements_mtime}|{sys.version}".encode()).hexdigest()
+
+def load_cached_result(key):
+    """Check whether the cache holds a successful check for this key"""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
         return False
+    return cached.get("key") == key and cached.get("python_ok") is True and cached.get("deps_ok") is True
+
+def save_cached_result(key, python_ok, deps_ok):
+    """Remember this check's result (the cache is only an optimization, so errors are ignored)"""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({"key": key, "python_ok": python_ok, "deps_ok": deps_ok}, f)
+    except OSError:
+        pass
+
+def requirements_hash():
+    """SHA-256 of this project's requirements.txt, or None if it can't be read"""
+    try:
+        with open('requirements.txt', 'rb') as f:
+            contents = f.read()
+    except OSError:
+        return None
+    # The project path is hashed in too, since the stamp in ~/.cache is
+    # shared by every checkout
+    return hashlib.sha256(os.fsencode(os.getcwd()) + b"\0" + contents).hexdigest()
+
+def stamp_file():
+    """Where the --fast stamp lives: a real virtualenv in .venv, else the cache directory"""
+    if (VENV_STAMP_FILE.parent / "pyvenv.cfg").is_file():
+        return VENV_STAMP_FILE
+    return CACHE_STAMP_FILE
+
+def fast_check():
+    """Check whether requirements.txt is unchanged since the last successful verification"""
+    digest = requirements_hash()
+    try:
+        return digest is not None and stamp_file().read_text() == digest
+    except OSError:
+        return False
+
+def write_stamp():
+    """Record requirements.txt as verified (only an optimization, so errors are ignored)"""
+    digest = requirements_hash()
+    if digest is None:
+        return
+    try:
+        stamp = stamp_file()
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(digest)
+    except OSError:
+        pass
+
+def write_lines(lines):
+    """Write report lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 def main():
     """Main verification"""
-    print("=" * 50)
-    print("EYE MOUSE CONTROL - INSTALLATION VERIFICATION")
-    print("=" * 50)
-    
-    # Check Python version
-    python_ok = check_python_version()
+    # The report is collected and written in one go rather than line by line
+    out = ["=" * 50, "EYE MOUSE CONTROL - INSTALLATION VERIFICATION", "=" * 50]
     
-    # Check dependencies
-    deps_ok = check_dependencies()
+    key = cache_key()
+    if load_cached_result(key):
+        # Same interpreter and requirements as the last successful check
+        out.append(f"{_OK} Python and dependencies (cached) OK")
+        python_ok = deps_ok = True
+    else:
+        # Check Python version
+        python_ok, lines = check_python_version()
+        out += lines
+        
+        # Check dependencies
+        deps_ok, lines = check_dependencies()
+        out += lines
+        
+        if python_ok and deps_ok:
+            save_cached_result(key, python_ok, deps_ok)
     
     # Check files
-    files_ok = check_files()
+    files_ok, lines = check_files()
+    out += lines
     
     # Summary
-    print("\n" + "=" * 50)
-    print("VERIFICATION SUMMARY")
-    print("=" * 50)
-    
-    print(f"Python Version: {'✅ OK' if python_ok else '❌ NEEDS UPDATE'}")
-    print(f"Dependencies: {'✅ OK' if deps_ok else '❌ NEEDS INSTALLATION'}")
-    print(f"Project Files: {'✅ OK' if files_ok else '❌ INCOMPLETE'}")
+    out += [
+        "\n" + "=" * 50,
+        "VERIFICATION SUMMARY",
+        "=" * 50,
+        "",
+        f"Python Version: {_OK + ' OK' if python_ok else _BAD + ' NEEDS UPDATE'}",
+        f"Dependencies: {_OK + ' OK' if deps_ok else _BAD + ' NEEDS INSTALLATION'}",
+        f"Project Files: {_OK + ' OK' if files_ok else _BAD + ' INCOMPLETE'}",
+    ]
     
     if python_ok and deps_ok and files_ok:
-        print("\n🎉 INSTALLATION COMPLETE - System ready!")
-        print("\nTo start the application:")
-        print("  python eye_mouse_control.py")
-        print("\nTo configure settings:")
-        print("  python config_gui.py")
-        print("\nTo run tests:")
-        print("  python quick_test.py")
+        out += [
+            f"\n{_PARTY} INSTALLATION COMPLETE - System ready!",
+            "\nTo start the application:",
+            "  python eye_mouse_control.py",
+            "\nTo configure settings:",
+            "  python config_gui.py",
+            "\nTo run tests:",
+            "  python quick_test.py",
+        ]
+        write_lines(out)
         return 0
     else:
-        print("\n⚠️  INSTALLATION INCOMPLETE")
+        out.append(f"\n{_WARN}  INSTALLATION INCOMPLETE")
         
         if not python_ok:
-            print("\nPlease install Python 3.9 or higher")
+            out.append("\nPlease install Python %d.%d or higher" % _MIN_PY)
         
         if not deps_ok:
-            print("\nInstalling missing dependencies...")
+            out.append("\nInstalling missing dependencies...")
+            # Show the report so far before pip starts writing its own output
+            write_lines(out)
+            out = []
             if install_missing():
-                print("✅ Dependencies installed - Please run verification again")
+                out.append(f"{_OK} Dependencies installed - Please run verification again")
             else:
-                print("❌ Manual installation required:")
-                print("  pip install -r requirements.txt")
+                out.append(f"{_BAD} Manual installation required:")
+                out.append("  pip install -r requirements.txt")
         
         if not files_ok:
-            print("\nSome project files are missing - Please re-download the project")
+            out.append("\nSome project files are missing - Please re-download the project")
         
+        if out:
+            write_lines(out)
         return 1
 
 if __name__ == "__main__":
+    # With --fast, skip every check when requirements.txt hasn't changed
+    # since the last successful --fast run
+    fast = '--fast' in sys.argv
+    if fast and fast_check():
+        print(f"{_OK} OK (cached)")
+        sys.exit(0)
+    
     exit_code = main()
-    input("\nPress Enter to exit...")
+    if fast and exit_code == 0:
+        write_stamp()
+    # Only wait for Enter when someone is at a terminal to press it
+    if sys.stdin.isatty() and '--no-wait' not in sys.argv:
+        input("\nPress Enter to exit...")
     sys.exit(exit_code)